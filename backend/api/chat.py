@@ -1,6 +1,7 @@
 from fastapi import APIRouter
 from pydantic import BaseModel
-from rag.orchestrator import answer_question
+from rag.orchestrator import answer_question, answer_session_turn
+from rag.sessions import sessions
 
 router = APIRouter()
 
@@ -8,16 +9,34 @@ class ChatRequest(BaseModel):
     user_id: str
     question: str
     debug: bool = False
+    session_id: str | None = None
 
 @router.post("/chat")
 def chat(req: ChatRequest):
-    answer, context = answer_question(req.user_id, req.question, debug=req.debug)
+    if req.session_id:
+        answer, context, prefill_saved = answer_session_turn(
+            req.user_id,
+            req.question,
+            req.session_id,
+            debug=req.debug
+        )
+    else:
+        answer, context = answer_question(req.user_id, req.question, debug=req.debug)
 
     response = {
         "answer": answer
     }
 
+    if req.session_id:
+        response["session_id"] = req.session_id
+        response["prefill_tokens_saved"] = prefill_saved
+
     if req.debug:
         response["context"] = context
 
-    return response
\ No newline at end of file
+    return response
+
+@router.delete("/chat/{session_id}")
+def end_session(session_id: str):
+    sessions.drop(session_id)
+    return {"status": "ok"}
@@ -0,0 +1,30 @@
+class CacheBackend:
+    """
+    Namespaced key/value cache with optional per-entry TTL (seconds).
+
+    Values must be JSON-serialisable; lists of floats are treated as
+    embedding vectors by the shared backends.
+    """
+
+    def get(self, namespace: str, key: str):
+        raise NotImplementedError
+
+    def set(self, namespace: str, key: str, value, ttl: int | None = None):
+        raise NotImplementedError
+
+    def delete(self, namespace: str, key: str):
+        raise NotImplementedError
+
+    def invalidate(self, namespace: str):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def trim(self, namespace: str, max_entries: int):
+        # Keep only the max_entries most recently written keys of a namespace
+        raise NotImplementedError
+
+    def purge_expired(self):
+        # Backends that expire entries themselves (e.g. Redis) have nothing to do
+        pass
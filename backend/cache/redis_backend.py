@@ -0,0 +1,89 @@
+import time
+
+from cache.base import CacheBackend
+from cache.serialization import dumps, loads
+
+try:
+    import redis
+except ImportError:  # optional dependency
+    redis = None
+
+
+class RedisCache(CacheBackend):
+    """
+    Cache in Redis (or anything speaking its protocol), shared across hosts.
+    TTLs are handled by Redis itself.
+
+    Each namespace keeps a sorted set of its keys scored by expiry time, so
+    invalidation removes exactly that namespace (not "embeddings:..." when
+    invalidating "embeddings") without glob patterns built from user text,
+    and expired members can be dropped from the set in one command.
+    """
+
+    def __init__(self, url: str | None = None, prefix: str = "onboarding:", client=None):
+        if client is None:
+            if redis is None:
+                raise RuntimeError("CACHE_BACKEND=redis needs the redis package: pip install redis")
+            client = redis.Redis.from_url(url)
+
+        self.client = client
+        self.prefix = prefix
+
+    def _key(self, namespace: str, key: str):
+        return f"{self.prefix}d:{namespace}:{key}"
+
+    def _index(self, namespace: str):
+        return f"{self.prefix}n:{namespace}"
+
+    def get(self, namespace: str, key: str):
+        data = self.client.get(self._key(namespace, key))
+        return loads(data) if data is not None else None
+
+    def set(self, namespace: str, key: str, value, ttl: int | None = None):
+        k = self._key(namespace, key)
+        index = self._index(namespace)
+        expires_at = time.time() + ttl if ttl else float("inf")
+
+        self.client.set(k, dumps(value), ex=ttl or None)
+        self.client.zadd(index, {k: expires_at})
+        # Keep the index from collecting keys Redis has already expired
+        self.client.zremrangebyscore(index, "-inf", time.time())
+
+    def delete(self, namespace: str, key: str):
+        k = self._key(namespace, key)
+        self.client.delete(k)
+        self.client.zrem(self._index(namespace), k)
+
+    def invalidate(self, namespace: str):
+        index = self._index(namespace)
+        keys = self.client.zrange(index, 0, -1)
+        for i in range(0, len(keys), 500):
+            self.client.delete(*keys[i:i + 500])
+        self.client.delete(index)
+
+    def clear(self):
+        batch = []
+        for k in self.client.scan_iter(match=f"{self.prefix}*", count=500):
+            batch.append(k)
+            if len(batch) >= 500:
+                self.client.delete(*batch)
+                batch = []
+        if batch:
+            self.client.delete(*batch)
+
+    def trim(self, namespace: str, max_entries: int):
+        # Scores are expiry times; for a namespace written with one TTL that
+        # is write order
+        index = self._index(namespace)
+        excess = self.client.zcard(index) - max_entries
+        if excess <= 0:
+            return
+
+        keys = self.client.zrange(index, 0, excess - 1)
+        self.client.delete(*keys)
+        self.client.zrem(index, *keys)
+
+    def purge_expired(self):
+        now = time.time()
+        for index in self.client.scan_iter(match=f"{self.prefix}n:*", count=500):
+            self.client.zremrangebyscore(index, "-inf", now)
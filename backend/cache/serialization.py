@@ -0,0 +1,22 @@
+import json
+from array import array
+
+# One tag byte, then the payload. Embedding vectors are stored as packed
+# float32 (what Pinecone keeps anyway) instead of JSON text, which is about
+# a quarter of the size and much faster to decode.
+VECTOR = b"v"
+JSON = b"j"
+
+def is_vector(value):
+    return isinstance(value, list) and len(value) > 0 and all(type(x) is float for x in value)
+
+def dumps(value) -> bytes:
+    if is_vector(value):
+        return VECTOR + array("f", value).tobytes()
+    return JSON + json.dumps(value).encode("utf-8")
+
+def loads(data: bytes):
+    tag, payload = data[:1], data[1:]
+    if tag == VECTOR:
+        return array("f", payload).tolist()
+    return json.loads(payload.decode("utf-8"))
@@ -0,0 +1,112 @@
+import os
+import sqlite3
+import threading
+import time
+
+from cache.base import CacheBackend
+from cache.serialization import dumps, loads
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_PATH = os.path.join(BACKEND_DIR, "data", "cache.sqlite3")
+# Expired rows are only removed when read; sweep the table every N writes
+PURGE_EVERY = 1000
+
+
+class SQLiteCache(CacheBackend):
+    """
+    Cache in a single SQLite file in WAL mode, so every uvicorn worker on the
+    host reads the same entries and readers never block the writer.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = path or DEFAULT_PATH
+        self._local = threading.local()
+        self._writes = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with self._conn() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value BLOB NOT NULL,
+                    expires_at REAL,
+                    PRIMARY KEY (namespace, key)
+                )
+            """)
+
+    def _conn(self):
+        # sqlite3 connections can't be shared across threads; FastAPI runs
+        # sync endpoints in a thread pool, so keep one per thread.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, namespace: str, key: str):
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT value, expires_at FROM cache WHERE namespace = ? AND key = ?",
+            (namespace, key)
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        value, expires_at = row
+        if expires_at is not None and expires_at < time.time():
+            with conn:
+                conn.execute(
+                    "DELETE FROM cache WHERE namespace = ? AND key = ? AND expires_at < ?",
+                    (namespace, key, time.time())
+                )
+            return None
+
+        return loads(value)
+
+    def set(self, namespace: str, key: str, value, ttl: int | None = None):
+        expires_at = time.time() + ttl if ttl else None
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (namespace, key, dumps(value), expires_at)
+            )
+
+        self._writes += 1
+        if self._writes % PURGE_EVERY == 0:
+            self.purge_expired()
+
+    def delete(self, namespace: str, key: str):
+        with self._conn() as conn:
+            conn.execute("DELETE FROM cache WHERE namespace = ? AND key = ?", (namespace, key))
+
+    def invalidate(self, namespace: str):
+        with self._conn() as conn:
+            conn.execute("DELETE FROM cache WHERE namespace = ?", (namespace,))
+
+    def clear(self):
+        with self._conn() as conn:
+            conn.execute("DELETE FROM cache")
+
+    def trim(self, namespace: str, max_entries: int):
+        # INSERT OR REPLACE gives a rewritten row a new, highest rowid, so
+        # rowid order is write order
+        with self._conn() as conn:
+            conn.execute(
+                """
+                DELETE FROM cache WHERE namespace = ? AND rowid NOT IN (
+                    SELECT rowid FROM cache WHERE namespace = ? ORDER BY rowid DESC LIMIT ?
+                )
+                """,
+                (namespace, namespace, max_entries)
+            )
+
+    def purge_expired(self):
+        with self._conn() as conn:
+            conn.execute(
+                "DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at < ?",
+                (time.time(),)
+            )
@@ -0,0 +1,96 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from dotenv import load_dotenv
+from cache.base import CacheBackend
+load_dotenv()
+
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+
+
+class MemoryCache(CacheBackend):
+    """
+    Per-process LRU cache. Also the stand-in for the shared backends in tests.
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, namespace: str, key: str):
+        with self._lock:
+            entry = self._data.get((namespace, key))
+            if entry is None:
+                return None
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at < time.time():
+                del self._data[(namespace, key)]
+                return None
+
+            self._data.move_to_end((namespace, key))
+            return value
+
+    def set(self, namespace: str, key: str, value, ttl: int | None = None):
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            self._data[(namespace, key)] = (value, expires_at)
+            self._data.move_to_end((namespace, key))
+
+            if len(self._data) > self.max_entries:
+                self._purge_expired()
+                while len(self._data) > self.max_entries:
+                    self._data.popitem(last=False)
+
+    def delete(self, namespace: str, key: str):
+        with self._lock:
+            self._data.pop((namespace, key), None)
+
+    def invalidate(self, namespace: str):
+        with self._lock:
+            for k in [k for k in self._data if k[0] == namespace]:
+                del self._data[k]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def trim(self, namespace: str, max_entries: int):
+        with self._lock:
+            keys = [k for k in self._data if k[0] == namespace]
+            for k in keys[:max(len(keys) - max_entries, 0)]:
+                del self._data[k]
+
+    def purge_expired(self):
+        with self._lock:
+            self._purge_expired()
+
+    def _purge_expired(self):
+        now = time.time()
+        for k in [k for k, (_, exp) in self._data.items() if exp is not None and exp < now]:
+            del self._data[k]
+
+
+def get_cache(backend: str | None = None) -> CacheBackend:
+    # memory: one cache per uvicorn worker
+    # sqlite: one WAL database file shared by all workers on the host
+    # redis:  shared across hosts, needs the redis package
+    backend = (backend or os.getenv("CACHE_BACKEND", "memory")).lower()
+
+    if backend == "sqlite":
+        from cache.sqlite_backend import SQLiteCache
+        return SQLiteCache(os.getenv("CACHE_PATH"))
+
+    if backend == "redis":
+        from cache.redis_backend import RedisCache
+        return RedisCache(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+
+    if backend == "memory":
+        return MemoryCache()
+
+    raise ValueError(f"Unknown CACHE_BACKEND: {backend}")
+
+
+cache = get_cache()
@@ -1,6 +1,10 @@
 from neo4j import GraphDatabase
+from cache.store import cache
 import os
 
+USER_CONTEXT_NAMESPACE = "user_context"
+USER_CONTEXT_TTL = int(os.getenv("USER_CONTEXT_TTL", "300"))
+
 class Neo4jClient:
     def __init__(self):
         self.uri = os.getenv("NEO4J_URI", "bolt://localhost:7687")
@@ -16,6 +20,10 @@ class Neo4jClient:
     # GET EMPLOYEE CONTEXT
     # -------------------------
     def get_user_context(self, employee_id: str):
+        cached = cache.get(USER_CONTEXT_NAMESPACE, employee_id)
+        if cached is not None:
+            return cached
+
         query = """
         MATCH (e:Employee {id:$id})
         OPTIONAL MATCH (e)-[:WORKS_IN]->(d:Department)
@@ -39,7 +47,9 @@ class Neo4jClient:
             if not record:
                 return None
 
-            return dict(record)
+            user = dict(record)
+            cache.set(USER_CONTEXT_NAMESPACE, employee_id, user, ttl=USER_CONTEXT_TTL)
+            return user
 
     # -------------------------
     # LIST USERS BY ROLE
@@ -14,6 +14,7 @@ sys.path.insert(0, BACKEND_DIR)
 # -------------------------------
 from vector.pinecone_client import embed, index
 from graph.neo4j_client import Neo4jClient
+from ingestion.run_info import write_ingestion_run
 
 # -------------------------------
 # Paths
@@ -83,7 +84,8 @@ def ingest_all_documents():
     print(f"🚀 Uploading {len(vectors)} chunks to Pinecone...")
     index.upsert(vectors=vectors)
 
-    print("✅ Ingestion complete!")
+    run_id = write_ingestion_run()
+    print(f"✅ Ingestion complete! (run {run_id})")
 
 # -------------------------------
 # Entry
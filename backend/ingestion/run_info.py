@@ -0,0 +1,45 @@
+import os
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUN_FILE = os.path.join(BACKEND_DIR, "data", "ingestion_run.json")
+RUN_ID_TTL = int(os.getenv("INGESTION_RUN_TTL", "30"))
+
+_current = {"run_id": None, "read_at": 0.0}
+
+# -------------------------------
+# Ingestion run id
+# -------------------------------
+# Anything derived from the Pinecone index (precomputed answers, cached
+# retrievals) is keyed by this id so a re-ingest makes it stale.
+def write_ingestion_run():
+    run = {
+        "run_id": uuid.uuid4().hex,
+        "created_at": datetime.now(timezone.utc).isoformat()
+    }
+
+    os.makedirs(os.path.dirname(RUN_FILE), exist_ok=True)
+    with open(RUN_FILE, "w", encoding="utf-8") as f:
+        json.dump(run, f)
+
+    return run["run_id"]
+
+def read_ingestion_run():
+    try:
+        with open(RUN_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)["run_id"]
+    except (OSError, ValueError, KeyError):
+        return "unversioned"
+
+def current_ingestion_run():
+    # Request-path version of read_ingestion_run: re-reads the file at most
+    # every RUN_ID_TTL seconds.
+    now = time.monotonic()
+    if _current["run_id"] is None or now - _current["read_at"] > RUN_ID_TTL:
+        _current["run_id"] = read_ingestion_run()
+        _current["read_at"] = now
+
+    return _current["run_id"]
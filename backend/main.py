@@ -1,13 +1,24 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from api.chat import router
 from api.users import router as users_router
+from rag.precompute import warm_up, watch_precomputed
+import os
 
 
 from dotenv import load_dotenv
 
 load_dotenv()
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Serve the common onboarding questions from cache right after a deploy
+    warm_up(compute_if_stale=os.getenv("WARMUP_PRECOMPUTE", "false").lower() == "true")
+    # Pick up answers rebuilt by another worker or by rag/precompute.py
+    watch_precomputed()
+    yield
+
+app = FastAPI(lifespan=lifespan)
 app.include_router(router)
 app.include_router(users_router)
 @app.get("/")
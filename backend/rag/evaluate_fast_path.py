@@ -0,0 +1,102 @@
+import os
+import re
+import sys
+import time
+import argparse
+
+# -------------------------------
+# Fix import path (no __init__.py needed)
+# -------------------------------
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(CURRENT_DIR)
+sys.path.insert(0, BACKEND_DIR)
+
+# -------------------------------
+# Imports
+# -------------------------------
+from rag.orchestrator import ask_llm, build_role_prefix, build_turn
+from rag.extractive import fast_answer, terms, FAST_ANSWER_MIN_SCORE, FAST_ANSWER_MIN_MARGIN
+from rag.precompute import QUESTIONS
+from vector.pinecone_client import search
+
+# -------------------------------
+# Agreement
+# -------------------------------
+def token_f1(a: str, b: str):
+    a_terms, b_terms = terms(a), terms(b)
+    common = len(a_terms & b_terms)
+    if common == 0:
+        return 0.0
+
+    precision = common / len(a_terms)
+    recall = common / len(b_terms)
+    return 2 * precision * recall / (precision + recall)
+
+def numbers(text: str):
+    return set(re.findall(r"\d+(?:\.\d+)?", text))
+
+def agrees(fast: str, full: str, min_f1: float = 0.3):
+    # Every figure the extractive answer states must appear in the LLM's
+    # answer (e.g. "12 days"), and the wording must overlap reasonably.
+    fast_text = fast.split("\n\nSource:")[0]
+    return numbers(fast_text) <= numbers(full) and token_f1(fast_text, full) >= min_f1
+
+# -------------------------------
+# Evaluation
+# -------------------------------
+def evaluate(questions, employment_type="full_time", min_score=None, min_margin=None):
+    hits, agreed = 0, 0
+    fast_ms = []
+
+    for question in questions:
+        results = search(question)
+
+        start = time.perf_counter()
+        fast = fast_answer(question, results, employment_type, min_score, min_margin)
+        elapsed = (time.perf_counter() - start) * 1000
+
+        top = results[0].get("score") if results else None
+        if fast is None:
+            print(f"➖ miss  score={top}  {question}")
+            continue
+
+        hits += 1
+        fast_ms.append(elapsed)
+
+        docs = "\n\n".join([m["metadata"]["text"] for m in results])
+        full = ask_llm(build_role_prefix(employment_type) + build_turn(docs, question))
+
+        ok = agrees(fast, full)
+        agreed += ok
+        print(f"{'✅' if ok else '❌'} hit   score={top}  {elapsed:.2f}ms  {question}")
+        if not ok:
+            print(f"    fast: {fast}")
+            print(f"    llm:  {full}")
+
+    total = len(questions)
+    print()
+    print(f"Hit rate:        {hits}/{total} ({hits / total:.0%})" if total else "No questions")
+    if hits:
+        print(f"Agreement:       {agreed}/{hits} ({agreed / hits:.0%})")
+        print(f"Fast path (max): {max(fast_ms):.2f}ms")
+
+    return {"questions": total, "hits": hits, "agreed": agreed, "fast_ms": fast_ms}
+
+# -------------------------------
+# Entry
+# -------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the extractive fast path with full llama3 answers")
+    parser.add_argument("questions", nargs="?", help="File with one question per line (default: curated list)")
+    parser.add_argument("--employment-type", default="full_time")
+    parser.add_argument("--min-score", type=float, default=FAST_ANSWER_MIN_SCORE)
+    parser.add_argument("--min-margin", type=float, default=FAST_ANSWER_MIN_MARGIN)
+    args = parser.parse_args()
+
+    if args.questions:
+        with open(args.questions, "r", encoding="utf-8") as f:
+            questions = [line.strip() for line in f if line.strip()]
+    else:
+        questions = QUESTIONS
+
+    evaluate(questions, args.employment_type, args.min_score, args.min_margin)
@@ -0,0 +1,123 @@
+import os
+import re
+
+FAST_ANSWER_ENABLED = os.getenv("FAST_ANSWER_ENABLED", "false").lower() == "true"
+FAST_ANSWER_MIN_SCORE = float(os.getenv("FAST_ANSWER_MIN_SCORE", "0.80"))
+FAST_ANSWER_MIN_MARGIN = float(os.getenv("FAST_ANSWER_MIN_MARGIN", "0.05"))
+FAST_ANSWER_MAX_SENTENCES = 2
+# Adjacent chunks share CHUNK_OVERLAP (25) words; a shared run this long
+# means two matches are windows over the same passage
+FAST_ANSWER_OVERLAP_WORDS = 8
+
+STOPWORDS = {
+    "a", "an", "the", "i", "my", "me", "we", "our", "you", "your", "do", "does",
+    "did", "is", "are", "am", "be", "can", "could", "how", "what", "when", "where",
+    "which", "who", "why", "of", "to", "in", "on", "for", "at", "by", "with",
+    "and", "or", "if", "get", "there", "any", "it", "this", "that", "as"
+}
+
+# How each EmploymentType.name is referred to in the policy text
+ROLE_PATTERNS = {
+    "intern": re.compile(r"\binterns?(hips?)?\b", re.IGNORECASE),
+    "full_time": re.compile(r"\bfull[- ]?time\b|\bpermanent\b", re.IGNORECASE),
+}
+
+def terms(text: str):
+    return {w for w in re.findall(r"[a-z0-9]+", text.lower()) if w not in STOPWORDS}
+
+def split_sentences(text: str):
+    return [s.strip() for s in re.split(r"(?<=[.!?])\s+", text) if s.strip()]
+
+def complete_sentences(text: str):
+    # Chunks are fixed-size word windows, so the first and last pieces are
+    # usually cut mid-sentence ("employees get 20 days..."); drop those.
+    sentences = split_sentences(text)
+    if sentences and not re.match(r"[A-Z0-9\"'(]", sentences[0]):
+        sentences = sentences[1:]
+    if sentences and not re.search(r"[.!?][\"')]?$", sentences[-1]):
+        sentences = sentences[:-1]
+    return sentences
+
+def shingles(text: str, size: int = FAST_ANSWER_OVERLAP_WORDS):
+    words = text.split()
+    return {tuple(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+def overlaps(a, b):
+    if a["metadata"].get("source_file") != b["metadata"].get("source_file"):
+        return False
+    return bool(shingles(a["metadata"]["text"]) & shingles(b["metadata"]["text"]))
+
+def is_confident(results, min_score: float = None, min_margin: float = None):
+    min_score = FAST_ANSWER_MIN_SCORE if min_score is None else min_score
+    min_margin = FAST_ANSWER_MIN_MARGIN if min_margin is None else min_margin
+
+    if not results:
+        return False
+
+    top = results[0].get("score") or 0.0
+
+    # The window overlapping the top chunk repeats its text and scores almost
+    # the same, so it is skipped. Any other chunk, from the same document or
+    # not, is a competing answer.
+    runner_up = max(
+        [(m.get("score") or 0.0) for m in results[1:] if not overlaps(results[0], m)],
+        default=0.0
+    )
+
+    return top >= min_score and top - runner_up >= min_margin
+
+def extract_answer(question: str, match, employment_type: str):
+    """
+    Picks the sentences of the best chunk that share the most terms with the
+    question (and at least half as many as the best one), in their original
+    order. Sentences about another employment type are left out, and ones
+    about the user's own type (or a type the question names) are preferred.
+    Returns None when nothing fits.
+    """
+    roles = {employment_type} | {r for r, p in ROLE_PATTERNS.items() if p.search(question)}
+    own = [p for r, p in ROLE_PATTERNS.items() if r in roles]
+    others = [p for r, p in ROLE_PATTERNS.items() if r not in roles]
+
+    q_terms = terms(question)
+    sentences = complete_sentences(match["metadata"]["text"])
+
+    scored = []
+    for i, s in enumerate(sentences):
+        is_own = any(p.search(s) for p in own)
+        if not is_own and any(p.search(s) for p in others):
+            continue
+
+        overlap = len(q_terms & terms(s))
+        if overlap > 0:
+            scored.append((overlap, is_own, i))
+
+    # A general rule next to a role-specific one would contradict it
+    if any(is_own for _, is_own, _ in scored):
+        scored = [x for x in scored if x[1]]
+
+    if not scored:
+        return None
+
+    top = max(n for n, _, _ in scored)
+    best = sorted(
+        [x for x in scored if x[0] * 2 >= top],
+        key=lambda x: (-x[0], x[2])
+    )[:FAST_ANSWER_MAX_SENTENCES]
+
+    text = " ".join(sentences[i] for _, _, i in sorted(best, key=lambda x: x[2]))
+
+    source = match["metadata"].get("source_file")
+    return f"{text}\n\nSource: {source}" if source else text
+
+def fast_answer(question: str, results, employment_type: str, min_score: float = None, min_margin: float = None):
+    """
+    Returns an extractive answer from the top match, or None when retrieval
+    is not confident enough (or the user's role is unknown) to skip the LLM.
+    """
+    if employment_type not in ROLE_PATTERNS:
+        return None
+
+    if not is_confident(results, min_score, min_margin):
+        return None
+
+    return extract_answer(question, results[0], employment_type)
@@ -1,30 +1,51 @@
 from graph.neo4j_client import Neo4jClient
 from vector.pinecone_client import search
+from rag.sessions import sessions
+from rag.extractive import fast_answer, FAST_ANSWER_ENABLED
+from cache.store import cache
+from ingestion.run_info import current_ingestion_run
 import requests
+import re
 import os
 
 graph = Neo4jClient()
 OLLAMA_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+ANSWER_NAMESPACE = "answers"
 
-def ask_llm(prompt: str):
-    r = requests.post(f"{OLLAMA_URL}/api/generate", json={
+def generate(prompt: str, context: list | None = None):
+    payload = {
         "model": "llama3",
         "prompt": prompt,
-        "stream": False
-    }, timeout=120)
-    return r.json()["response"]
+        "stream": False,
+        "keep_alive": OLLAMA_KEEP_ALIVE
+    }
+    if context:
+        payload["context"] = context
 
-def answer_question(user_id: str, question: str, debug: bool = False):
-    user = graph.get_user_context(user_id)
-    if not user:
-        return "User not found.", None
+    r = requests.post(f"{OLLAMA_URL}/api/generate", json=payload, timeout=120)
+    return r.json()
 
-    # Get documents
-    results = search(question)
+def ask_llm(prompt: str):
+    return generate(prompt)["response"]
 
-    docs = "\n\n".join([m["metadata"]["text"] for m in results])
+def prefill_tokens_saved(result: dict):
+    # Ollama's returned context is every token the model has seen (earlier
+    # turns + this prompt + the answer); prompt_eval_count is the part it
+    # actually had to prefill. The difference was served from the KV cache.
+    context = result.get("context")
+    if not context or "prompt_eval_count" not in result:
+        return 0
+
+    prompt_tokens = len(context) - result.get("eval_count", 0)
+    return max(prompt_tokens - result["prompt_eval_count"], 0)
 
-    prompt = f"""
+# -------------------------
+# PROMPT
+# -------------------------
+def build_prefix(user: dict):
+    # Only per-user values go here so the prefix is byte-identical on every turn
+    return f"""
 You are GlideCloud's HR assistant.
 
 User role: {user["employment_type"]}
@@ -34,7 +55,22 @@ Mentor: {user.get("mentor")}
 Department: {user.get("department")}
 College: {user.get("college")}
 
-Answer ONLY from the policy text below:
+"""
+
+def build_role_prefix(employment_type: str):
+    # For answers shared by everyone of an employment type: no name, manager
+    # or other personal lines, so the model can't address or refer to anyone
+    return f"""
+You are GlideCloud's HR assistant.
+
+User role: {employment_type}
+
+Do not address the user by name or refer to a specific manager, mentor or department.
+
+"""
+
+def build_turn(docs: str, question: str):
+    return f"""Answer ONLY from the policy text below:
 
 ----------------
 {docs}
@@ -43,9 +79,113 @@ Answer ONLY from the policy text below:
 Question: {question}
 """
 
-    answer = ask_llm(prompt)
+def build_history(history):
+    if not history:
+        return ""
+
+    turns = "\n\n".join([f"Q: {q}\nA: {a}" for q, a in history])
+    return f"Earlier in this conversation:\n\n{turns}\n\n"
+
+# -------------------------
+# ANSWER CACHE
+# -------------------------
+def normalize_question(question: str):
+    return " ".join(re.sub(r"[^a-z0-9 ]", " ", question.lower()).split())
+
+def answer_cache_key(employment_type: str, question: str, run_id: str | None = None):
+    # Precomputed answers only depend on employment type, and are tied to the
+    # ingestion run they were retrieved against.
+    run_id = run_id or current_ingestion_run()
+    return f"{run_id}:{employment_type}:{normalize_question(question)}"
+
+def cached_answer(employment_type: str, question: str):
+    return cache.get(ANSWER_NAMESPACE, answer_cache_key(employment_type, question))
+
+# -------------------------
+# ANSWER
+# -------------------------
+def answer_question(user_id: str, question: str, debug: bool = False, session_id: str | None = None):
+    if session_id:
+        answer, context, _ = answer_session_turn(user_id, question, session_id, debug=debug)
+        return answer, context
+
+    user = graph.get_user_context(user_id)
+    if not user:
+        return "User not found.", None
+
+    return _answer(user, question, debug)
+
+def answer_session_turn(user_id: str, question: str, session_id: str, debug: bool = False):
+    """
+    Like answer_question, but also returns the prefill tokens saved by this
+    turn, read under the session lock so a concurrent turn can't replace it.
+    """
+    user = graph.get_user_context(user_id)
+    if not user:
+        return "User not found.", None, 0
+
+    session = sessions.get_or_create(session_id, user_id)
+    with session.lock:
+        sessions.load(session)
+        answer, context = _answer(user, question, debug, session)
+        prefill_saved = session.last_prefill_saved
+        sessions.save(session)
+
+    return answer, context, prefill_saved
+
+def _answer(user: dict, question: str, debug: bool, session=None):
+    # Cached and extractive answers carry no conversation, so they only stand
+    # in for a stateless request or the opening question of a session
+    first_turn = session is None or session.is_fresh()
+
+    if first_turn:
+        hit = cached_answer(user["employment_type"], question)
+        if hit:
+            if session is not None:
+                session.record_turn(question, hit["answer"], None)
+            return hit["answer"], (hit["context"] if debug else None)
+
+    # Get documents
+    results = search(question)
+
+    docs = "\n\n".join([m["metadata"]["text"] for m in results])
+
+    answer = None
+    if first_turn and FAST_ANSWER_ENABLED:
+        # Confident retrieval: answer straight from the best chunk, no generation
+        answer = fast_answer(question, results, user.get("employment_type"))
+        if answer and session is not None:
+            session.record_turn(question, answer, None)
+
+    if not answer:
+        if session is not None:
+            answer = _answer_in_session(session, user, docs, question)
+        else:
+            answer = ask_llm(build_prefix(user) + build_turn(docs, question))
 
     if debug:
         return answer, [m["metadata"]["text"] for m in results]
     else:
-        return answer, None
\ No newline at end of file
+        return answer, None
+
+def _answer_in_session(session, user: dict, docs: str, question: str):
+    # Caller holds session.lock
+    prefix = build_prefix(user)
+    if prefix != session.prefix:
+        # User details changed in the graph; the cached context is stale
+        session.prefix = prefix
+        session.reset_context()
+
+    turn = build_turn(docs, question)
+
+    if session.context:
+        # Ollama continues from the previous turn's tokens, so only the new
+        # policy text and question need to be prefilled.
+        result = generate(turn, context=session.context)
+    else:
+        result = generate(prefix + build_history(session.history) + turn)
+
+    answer = result["response"]
+    session.record_turn(question, answer, result.get("context"), prefill_tokens_saved(result))
+
+    return answer
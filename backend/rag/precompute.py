@@ -0,0 +1,234 @@
+import os
+import sys
+import json
+import time
+import tempfile
+import threading
+
+# -------------------------------
+# Fix import path (no __init__.py needed)
+# -------------------------------
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(CURRENT_DIR)
+sys.path.insert(0, BACKEND_DIR)
+
+# -------------------------------
+# Imports
+# -------------------------------
+from rag.orchestrator import ask_llm, build_role_prefix, build_turn, answer_cache_key, ANSWER_NAMESPACE
+from vector.pinecone_client import embed, search, EMBED_MODEL, EMBED_NAMESPACE, EMBED_CACHE_TTL
+from ingestion.run_info import read_ingestion_run
+from cache.store import cache
+
+# -------------------------------
+# Config
+# -------------------------------
+PRECOMPUTED_FILE = os.path.join(BACKEND_DIR, "data", "precomputed_answers.json")
+# A rebuild lock older than this is assumed to belong to a dead worker
+REBUILD_LOCK_TIMEOUT = int(os.getenv("PRECOMPUTE_LOCK_TIMEOUT", "3600"))
+# How often each worker checks whether the file was rebuilt elsewhere
+PRECOMPUTED_CHECK_INTERVAL = int(os.getenv("PRECOMPUTED_CHECK_INTERVAL", "30"))
+
+# mtime of the file this worker last loaded
+_loaded = {"mtime": None}
+
+# Values of EmploymentType.name in the graph
+EMPLOYMENT_TYPES = ["intern", "full_time"]
+
+QUESTIONS = [
+    "How many leave days do I get?",
+    "How do I apply for leave?",
+    "Can I carry forward unused leave?",
+    "How many sick leave days do I get?",
+    "When is salary paid?",
+    "How do I access my payslip?",
+    "How do I get a laptop?",
+    "What should I do if my laptop is damaged?",
+    "How long is the probation period?",
+    "What happens at the end of probation?",
+    "Can I work from home?",
+    "What does the insurance policy cover?",
+    "What is the code of conduct?",
+]
+
+# -------------------------------
+# Precompute
+# -------------------------------
+def precompute_answers(questions=QUESTIONS, employment_types=EMPLOYMENT_TYPES):
+    run_id = read_ingestion_run()
+    embeddings = {}
+    answers = []
+
+    for question in questions:
+        # Retrieval does not depend on the user, only generation does
+        results = search(question)
+        embeddings[question] = embed(question)
+
+        context = [m["metadata"]["text"] for m in results]
+        docs = "\n\n".join(context)
+
+        for employment_type in employment_types:
+            answer = ask_llm(build_role_prefix(employment_type) + build_turn(docs, question))
+            answers.append({
+                "employment_type": employment_type,
+                "question": question,
+                "answer": answer,
+                "context": context
+            })
+
+        print(f"💬 {question} → {len(employment_types)} answers")
+
+    data = {
+        "run_id": run_id,
+        "embed_model": EMBED_MODEL,
+        "embeddings": embeddings,
+        "answers": answers
+    }
+
+    write_precomputed(data)
+    _loaded["mtime"] = precomputed_mtime()
+
+    # Answers from earlier ingestion runs can never be hit again
+    cache.invalidate(ANSWER_NAMESPACE)
+    load_into_cache(data)
+    print(f"✅ Precomputed {len(answers)} answers for run {run_id}")
+    return data
+
+def write_precomputed(data: dict):
+    # Write next to the target and swap it in, so a worker warming up never
+    # reads a half-written file
+    directory = os.path.dirname(PRECOMPUTED_FILE)
+    os.makedirs(directory, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, PRECOMPUTED_FILE)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+def precomputed_mtime():
+    try:
+        return os.path.getmtime(PRECOMPUTED_FILE)
+    except OSError:
+        return None
+
+def load_into_cache(data: dict):
+    for question, vec in data["embeddings"].items():
+        cache.set(EMBED_NAMESPACE, question, vec, ttl=EMBED_CACHE_TTL)
+
+    for entry in data["answers"]:
+        key = answer_cache_key(entry["employment_type"], entry["question"], data["run_id"])
+        cache.set(ANSWER_NAMESPACE, key, {
+            "answer": entry["answer"],
+            "context": entry["context"]
+        })
+
+    return len(data["answers"])
+
+# -------------------------------
+# Rebuild lock
+# -------------------------------
+# Every uvicorn worker runs warm_up; only the one holding this lock rebuilds.
+def acquire_rebuild_lock():
+    lock_path = PRECOMPUTED_FILE + ".lock"
+    os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+
+    for _ in range(2):
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(lock_path) < REBUILD_LOCK_TIMEOUT:
+                    return False
+                os.remove(lock_path)
+            except OSError:
+                return False
+            continue
+
+        os.write(fd, str(os.getpid()).encode())
+        os.close(fd)
+        return True
+
+    return False
+
+def release_rebuild_lock():
+    try:
+        os.remove(PRECOMPUTED_FILE + ".lock")
+    except OSError:
+        pass
+
+def rebuild_in_background():
+    if not acquire_rebuild_lock():
+        print("⏳ Precompute already running in another worker")
+        return False
+
+    def run():
+        try:
+            precompute_answers()
+        finally:
+            release_rebuild_lock()
+
+    threading.Thread(target=run, daemon=True).start()
+    return True
+
+# -------------------------------
+# Startup warm-up
+# -------------------------------
+def warm_up(compute_if_stale: bool = False):
+    """
+    Loads precomputed answers into the caches. Returns the number loaded.
+    With compute_if_stale, a missing or outdated file is rebuilt in the
+    background by whichever worker gets the rebuild lock.
+    """
+    cache.purge_expired()
+    run_id = read_ingestion_run()
+    _loaded["mtime"] = precomputed_mtime()
+
+    try:
+        with open(PRECOMPUTED_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        data = None
+
+    if data and data.get("run_id") == run_id and data.get("embed_model") == EMBED_MODEL:
+        count = load_into_cache(data)
+        print(f"🔥 Warmed cache with {count} precomputed answers (run {run_id})")
+        return count
+
+    print(f"⚠️ No precomputed answers for ingestion run {run_id}")
+    if compute_if_stale:
+        rebuild_in_background()
+
+    return 0
+
+# -------------------------------
+# Reload on change
+# -------------------------------
+# With a per-process cache only the worker that rebuilt the file has the new
+# answers in memory; the others pick them up from here.
+def reload_if_changed():
+    mtime = precomputed_mtime()
+    if mtime is None or mtime == _loaded["mtime"]:
+        return 0
+
+    return warm_up()
+
+def watch_precomputed(interval: int = PRECOMPUTED_CHECK_INTERVAL):
+    def run():
+        while True:
+            time.sleep(interval)
+            try:
+                reload_if_changed()
+            except Exception as e:
+                print(f"⚠️ Reloading precomputed answers failed: {e}")
+
+    threading.Thread(target=run, daemon=True).start()
+
+# -------------------------------
+# Entry
+# -------------------------------
+if __name__ == "__main__":
+    precompute_answers()
@@ -0,0 +1,139 @@
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from cache.store import cache
+
+SESSION_MAX = int(os.getenv("SESSION_MAX", "256"))
+SESSION_TTL = int(os.getenv("SESSION_TTL", "1800"))
+SESSION_MAX_TURNS = int(os.getenv("SESSION_MAX_TURNS", "6"))
+# llama3 has an 8k window; past this we stop extending the Ollama context
+# and start again from the user prefix plus the recent text history.
+SESSION_MAX_CONTEXT_TOKENS = int(os.getenv("SESSION_MAX_CONTEXT_TOKENS", "6000"))
+SESSION_NAMESPACE = "sessions"
+
+
+class Session:
+    def __init__(self, session_id: str, user_id: str):
+        self.session_id = session_id
+        self.user_id = user_id
+        self.prefix = None
+        self.context = None  # Ollama token context from the previous turn
+        self.history = deque(maxlen=SESSION_MAX_TURNS)
+        self.last_prefill_saved = 0
+        self.last_used = time.monotonic()
+        # Held for a whole turn so concurrent requests in one conversation
+        # don't both continue from the same context and interleave history
+        self.lock = threading.Lock()
+
+    def to_dict(self):
+        return {
+            "user_id": self.user_id,
+            "prefix": self.prefix,
+            "context": self.context,
+            "history": [list(turn) for turn in self.history],
+            "last_prefill_saved": self.last_prefill_saved
+        }
+
+    def load(self, data: dict):
+        self.prefix = data["prefix"]
+        self.context = data["context"]
+        self.history = deque([tuple(turn) for turn in data["history"]], maxlen=SESSION_MAX_TURNS)
+        self.last_prefill_saved = data["last_prefill_saved"]
+
+    def reset(self):
+        self.prefix = None
+        self.context = None
+        self.history = deque(maxlen=SESSION_MAX_TURNS)
+        self.last_prefill_saved = 0
+
+    def is_fresh(self):
+        return not self.history and not self.context
+
+    def reset_context(self):
+        self.context = None
+
+    def record_turn(self, question: str, answer: str, context, prefill_saved: int = 0):
+        self.history.append((question, answer))
+        self.last_prefill_saved = prefill_saved
+        if context and len(context) <= SESSION_MAX_CONTEXT_TOKENS:
+            self.context = context
+        else:
+            self.context = None
+
+
+class SessionStore:
+    """
+    Conversation store. Session state lives in the cache backend under the
+    "sessions" namespace (with SESSION_TTL), so with a shared backend a
+    follow-up can land on any worker. The namespace is trimmed to the
+    max_sessions most recently saved sessions on every save. Each worker also
+    keeps an LRU of Session objects, which hold the per-session lock; that
+    lock serialises turns within one worker only.
+    """
+
+    def __init__(self, max_sessions: int = SESSION_MAX, ttl: int = SESSION_TTL):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_create(self, session_id: str, user_id: str):
+        with self._lock:
+            self._evict_expired()
+
+            session = self._sessions.get(session_id)
+            # A session is bound to one user; reusing the id for someone else starts over
+            if session is None or session.user_id != user_id:
+                session = Session(session_id, user_id)
+                self._sessions[session_id] = session
+
+            session.last_used = time.monotonic()
+            self._sessions.move_to_end(session_id)
+
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+            return session
+
+    def load(self, session: Session):
+        # Caller holds session.lock. Another worker may have taken turns since
+        # this one last saw the session, so always start from the shared copy.
+        data = cache.get(SESSION_NAMESPACE, session.session_id)
+        if data and data["user_id"] == session.user_id:
+            session.load(data)
+        else:
+            session.reset()
+
+    def save(self, session: Session):
+        cache.set(SESSION_NAMESPACE, session.session_id, session.to_dict(), ttl=self.ttl)
+        cache.trim(SESSION_NAMESPACE, self.max_sessions)
+
+    def get(self, session_id: str):
+        with self._lock:
+            return self._sessions.get(session_id)
+
+    def drop(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+        cache.delete(SESSION_NAMESPACE, session_id)
+
+    def clear(self):
+        with self._lock:
+            self._sessions.clear()
+        cache.invalidate(SESSION_NAMESPACE)
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def _evict_expired(self):
+        now = time.monotonic()
+        expired = [
+            sid for sid, s in self._sessions.items()
+            if now - s.last_used > self.ttl
+        ]
+        for sid in expired:
+            del self._sessions[sid]
+
+
+sessions = SessionStore()
@@ -1,17 +1,50 @@
 import pytest
 import requests
+import os
+import json
+import time
+import fnmatch
+import tempfile
+import threading
+from contextlib import ExitStack
+from functools import wraps
 from unittest.mock import patch, MagicMock
 from fastapi.testclient import TestClient
 from main import app
 from rag.orchestrator import answer_question
 from graph.neo4j_client import Neo4jClient
 from vector.pinecone_client import embed, search
+from rag.sessions import sessions, SessionStore
+from vector.pinecone_client import EMBED_MODEL
+from cache.store import get_cache, MemoryCache
+from cache.sqlite_backend import SQLiteCache
+import rag.precompute
 
 # =====================================
 # Setup
 # =====================================
 client = TestClient(app)
 
+CACHE_MODULES = [
+    "cache.store",
+    "vector.pinecone_client",
+    "graph.neo4j_client",
+    "rag.orchestrator",
+    "rag.precompute",
+    "rag.sessions",
+]
+
+def fresh_cache(test):
+    """Run a test against its own MemoryCache, never the configured backend"""
+    @wraps(test)
+    def wrapper(*args, **kwargs):
+        stand_in = MemoryCache()
+        with ExitStack() as stack:
+            for module in CACHE_MODULES:
+                stack.enter_context(patch(f"{module}.cache", stand_in))
+            return test(*args, **kwargs)
+    return wrapper
+
 # =====================================
 # TEST 1: Health Check
 # =====================================
@@ -127,6 +160,7 @@ def test_chat_missing_question():
 # TEST 8: Get User Context
 # =====================================
 @patch('graph.neo4j_client.GraphDatabase.driver')
+@fresh_cache
 def test_get_user_context(mock_driver):
     """Test retrieving user context from Neo4j"""
     mock_session = MagicMock()
@@ -156,6 +190,7 @@ def test_get_user_context(mock_driver):
 @patch('rag.orchestrator.graph.get_user_context')
 @patch('rag.orchestrator.search')
 @patch('rag.orchestrator.ask_llm')
+@fresh_cache
 def test_answer_question_success(mock_llm, mock_search, mock_user):
     """Test successful question answering"""
     mock_user.return_value = {
@@ -187,6 +222,7 @@ def test_answer_question_success(mock_llm, mock_search, mock_user):
 # TEST 10: Answer Question - User Not Found
 # =====================================
 @patch('rag.orchestrator.graph.get_user_context')
+@fresh_cache
 def test_answer_question_user_not_found(mock_user):
     """Test when user is not found"""
     mock_user.return_value = None
@@ -201,6 +237,7 @@ def test_answer_question_user_not_found(mock_user):
 # TEST 11: Embed Function
 # =====================================
 @patch('vector.pinecone_client.requests.post')
+@fresh_cache
 def test_embed_function(mock_post):
     """Test text embedding"""
     mock_response = MagicMock()
@@ -249,6 +286,7 @@ def test_search_function(mock_query, mock_embed_func):
 @patch('rag.orchestrator.graph.get_user_context')
 @patch('rag.orchestrator.search')
 @patch('rag.orchestrator.ask_llm')
+@fresh_cache
 def test_answer_with_debug_context(mock_llm, mock_search, mock_user):
     """Test question answering with debug context"""
     mock_user.return_value = {
@@ -315,6 +353,634 @@ def test_chat_response_structure(mock_answer):
     assert len(data) == 1  # No context when debug=False
     print("✅ TEST 15 PASSED: Chat response structure correct")
 
+# =====================================
+# TEST 16: Session Follow-up Reuses Context
+# =====================================
+@patch('rag.orchestrator.graph.get_user_context')
+@patch('rag.orchestrator.search')
+@patch('rag.orchestrator.generate')
+@fresh_cache
+def test_session_followup_reuses_context(mock_generate, mock_search, mock_user):
+    """Test that a follow-up turn sends only the new turn plus Ollama's context"""
+    sessions.clear()
+    mock_user.return_value = {
+        "name": "Jane Smith",
+        "employment_type": "intern",
+        "department": "HR",
+        "manager": "Charlie",
+        "mentor": "Diana",
+        "college": "Stanford"
+    }
+    mock_search.return_value = [{"metadata": {"text": "Interns get 12 days of leave."}}]
+    mock_generate.side_effect = [
+        {"response": "12 days.", "context": list(range(300)),
+         "prompt_eval_count": 290, "eval_count": 10},
+        {"response": "Yes, they carry over.", "context": list(range(420)),
+         "prompt_eval_count": 100, "eval_count": 20},
+    ]
+
+    answer_question("EMP002", "How many leave days?", session_id="s1")
+    answer, _ = answer_question("EMP002", "Do they carry over?", session_id="s1")
+
+    first_prompt = mock_generate.call_args_list[0].args[0]
+    second_call = mock_generate.call_args_list[1]
+    assert "User name: Jane Smith" in first_prompt
+    assert "User name" not in second_call.args[0]
+    assert second_call.kwargs["context"] == list(range(300))
+    assert answer == "Yes, they carry over."
+    # 420 tokens seen - 20 generated = 400 prompt tokens, only 100 prefilled
+    assert sessions.get("s1").last_prefill_saved == 300
+    print("✅ TEST 16 PASSED: Session follow-up reuses context")
+
+# =====================================
+# TEST 17: Session Store Eviction
+# =====================================
+@fresh_cache
+def test_session_store_eviction():
+    """Test that stored sessions are capped, dropping the least recently saved"""
+    store = SessionStore(max_sessions=2, ttl=3600)
+    for sid, user_id in [("a", "EMP001"), ("b", "EMP002"), ("a", "EMP001"), ("c", "EMP003")]:
+        session = store.get_or_create(sid, user_id)
+        session.record_turn("Hi", "Hello", None)
+        store.save(session)
+
+    stored = rag.sessions.cache
+    assert stored.get("sessions", "b") is None
+    assert stored.get("sessions", "a")["user_id"] == "EMP001"
+    assert stored.get("sessions", "c")["user_id"] == "EMP003"
+    assert len(store) == 2
+    print("✅ TEST 17 PASSED: Session store eviction")
+
+# =====================================
+# TEST 18: Chat With Session
+# =====================================
+@patch('rag.orchestrator.graph.get_user_context')
+@patch('rag.orchestrator.search')
+@patch('rag.orchestrator.generate')
+@fresh_cache
+def test_chat_with_session(mock_generate, mock_search, mock_user):
+    """Test chat endpoint reports the prefill tokens saved on a follow-up turn"""
+    sessions.clear()
+    mock_user.return_value = {"name": "John Doe", "employment_type": "full_time"}
+    mock_search.return_value = [{"metadata": {"text": "Full-time employees get 20 days of leave."}}]
+    mock_generate.side_effect = [
+        {"response": "20 days.", "context": list(range(250)),
+         "prompt_eval_count": 240, "eval_count": 10},
+        {"response": "Up to 5 days carry over.", "context": list(range(330)),
+         "prompt_eval_count": 70, "eval_count": 10},
+    ]
+
+    first = client.post("/chat", json={
+        "user_id": "EMP001",
+        "question": "How many leave days do I get?",
+        "session_id": "abc"
+    }).json()
+    second = client.post("/chat", json={
+        "user_id": "EMP001",
+        "question": "Do they carry over?",
+        "session_id": "abc"
+    }).json()
+
+    assert first["session_id"] == "abc"
+    assert first["prefill_tokens_saved"] == 0
+    # 330 tokens seen - 10 generated = 320 prompt tokens, only 70 prefilled
+    assert second["prefill_tokens_saved"] == 250
+    assert second["answer"] == "Up to 5 days carry over."
+    sessions.clear()
+    print("✅ TEST 18 PASSED: Chat with session")
+
+# =====================================
+# TEST 19: Precomputed Answer Cache Hit
+# =====================================
+@patch('rag.orchestrator.graph.get_user_context')
+@patch('rag.orchestrator.search')
+@patch('rag.orchestrator.ask_llm')
+@patch('rag.precompute.search')
+@patch('rag.precompute.embed')
+@patch('rag.precompute.ask_llm')
+@fresh_cache
+def test_precomputed_answer_cache_hit(mock_pre_llm, mock_pre_embed, mock_pre_search,
+                                      mock_llm, mock_search, mock_user):
+    """Test that precomputed answers are served per employment type without retrieval"""
+    mock_pre_search.return_value = [{"metadata": {"text": "Interns get 12 days of leave."}}]
+    mock_pre_embed.return_value = [0.1, 0.2]
+    mock_pre_llm.side_effect = ["Interns get 12 days.", "Full-time staff get 20 days."]
+    mock_user.return_value = {"name": "Jane Smith", "employment_type": "intern"}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with patch.object(rag.precompute, "PRECOMPUTED_FILE", os.path.join(tmp, "answers.json")):
+            rag.precompute.precompute_answers(["How many leave days do I get?"], ["intern", "full_time"])
+
+    answer, context = answer_question("EMP002", "how many leave days do I get", debug=True)
+
+    assert answer == "Interns get 12 days."
+    assert context == ["Interns get 12 days of leave."]
+    prompt = mock_pre_llm.call_args_list[0].args[0]
+    assert "User role: intern" in prompt
+    assert "None" not in prompt and "User name" not in prompt
+    mock_search.assert_not_called()
+    mock_llm.assert_not_called()
+    print("✅ TEST 19 PASSED: Precomputed answer cache hit")
+
+# =====================================
+# TEST 20: Warm-up Skips Stale Ingestion Run
+# =====================================
+@patch('rag.precompute.read_ingestion_run')
+@fresh_cache
+def test_warm_up_versioned(mock_run):
+    """Test that warm-up only loads answers built from the current ingestion run"""
+    data = {
+        "run_id": "run-1",
+        "embed_model": EMBED_MODEL,
+        "embeddings": {"When is salary paid?": [0.3]},
+        "answers": [{"employment_type": "full_time", "question": "When is salary paid?",
+                     "answer": "On the last working day.", "context": []}]
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "answers.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+        with patch.object(rag.precompute, "PRECOMPUTED_FILE", path):
+            mock_run.return_value = "run-2"
+            assert rag.precompute.warm_up() == 0
+            mock_run.return_value = "run-1"
+            assert rag.precompute.warm_up() == 1
+
+    print("✅ TEST 20 PASSED: Warm-up versioned by ingestion run")
+
+# =====================================
+# TEST 21: Shared SQLite Cache Across Workers
+# =====================================
+def test_sqlite_cache_shared():
+    """Test that two cache instances on one file (two workers) share entries"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache.sqlite3")
+        worker_a = SQLiteCache(path)
+        worker_b = SQLiteCache(path)
+
+        worker_a.set("embeddings:test", "leave", [0.5, -0.25, 1.0])
+        worker_a.set("answers", "q1", {"answer": "12 days", "context": ["chunk"]})
+        worker_a.set("user_context", "EMP001", {"name": "John Doe"}, ttl=-1)
+
+        assert worker_b.get("embeddings:test", "leave") == [0.5, -0.25, 1.0]
+        assert worker_b.get("answers", "q1")["answer"] == "12 days"
+        assert worker_b.get("user_context", "EMP001") is None  # expired
+
+        worker_b.invalidate("answers")
+        assert worker_a.get("answers", "q1") is None
+        assert worker_a.get("embeddings:test", "leave") is not None
+
+        # Rewriting a key makes it the newest for trim
+        for sid in ["s1", "s2", "s1", "s3"]:
+            worker_a.set("sessions", sid, {"id": sid})
+        worker_b.trim("sessions", 2)
+        assert worker_a.get("sessions", "s2") is None
+        assert worker_a.get("sessions", "s1") == {"id": "s1"}
+        assert worker_a.get("sessions", "s3") == {"id": "s3"}
+    print("✅ TEST 21 PASSED: Shared SQLite cache")
+
+# =====================================
+# TEST 22: Cache Backend Selection
+# =====================================
+def test_cache_backend_selection():
+    """Test picking the cache backend by name"""
+    with tempfile.TemporaryDirectory() as tmp:
+        with patch.dict(os.environ, {"CACHE_PATH": os.path.join(tmp, "cache.sqlite3")}):
+            assert isinstance(get_cache("sqlite"), SQLiteCache)
+    assert get_cache("memory").get("answers", "missing") is None
+    with pytest.raises(ValueError):
+        get_cache("memcached")
+    print("✅ TEST 22 PASSED: Cache backend selection")
+
+# =====================================
+# TEST 23: User Context Is Cached
+# =====================================
+@patch('graph.neo4j_client.GraphDatabase.driver')
+@fresh_cache
+def test_user_context_cached(mock_driver):
+    """Test that a second lookup of the same employee skips Neo4j"""
+    mock_session = MagicMock()
+    mock_driver.return_value.session.return_value.__enter__.return_value = mock_session
+    mock_session.run.return_value.single.return_value = {"name": "John Doe", "employment_type": "full_time"}
+
+    graph = Neo4jClient()
+    graph.get_user_context("EMP001")
+    user = graph.get_user_context("EMP001")
+
+    assert user["name"] == "John Doe"
+    assert mock_session.run.call_count == 1
+    print("✅ TEST 23 PASSED: User context cached")
+
+# =====================================
+# TEST 24: Fast Path Extractive Answer
+# =====================================
+@patch('rag.orchestrator.FAST_ANSWER_ENABLED', True)
+@patch('rag.orchestrator.graph.get_user_context')
+@patch('rag.orchestrator.search')
+@patch('rag.orchestrator.ask_llm')
+@fresh_cache
+def test_fast_path_extractive_answer(mock_llm, mock_search, mock_user):
+    """Test that a confident top match is answered without the LLM"""
+    mock_user.return_value = {"name": "Jane Smith", "employment_type": "intern"}
+    mock_search.return_value = [
+        {"score": 0.91, "metadata": {
+            "text": "Leave is tracked in the HR portal. Interns get 12 days of leave per year. Unused days lapse.",
+            "source_file": "leave-policy.txt"}},
+        {"score": 0.72, "metadata": {"text": "Employees may work from home twice a week.",
+                                     "source_file": "wfh-policy.txt"}}
+    ]
+
+    answer, _ = answer_question("EMP002", "How many days of leave do interns get?", debug=False)
+
+    assert answer.startswith("Interns get 12 days of leave per year.")
+    assert "Source: leave-policy.txt" in answer
+    mock_llm.assert_not_called()
+    print("✅ TEST 24 PASSED: Fast path extractive answer")
+
+# =====================================
+# TEST 25: Fast Path Falls Back on Low Margin
+# =====================================
+@patch('rag.orchestrator.FAST_ANSWER_ENABLED', True)
+@patch('rag.orchestrator.graph.get_user_context')
+@patch('rag.orchestrator.search')
+@patch('rag.orchestrator.ask_llm')
+@fresh_cache
+def test_fast_path_low_margin(mock_llm, mock_search, mock_user):
+    """Test that a close match from another document sends the question to the LLM"""
+    mock_user.return_value = {"name": "Jane Smith", "employment_type": "intern"}
+    mock_search.return_value = [
+        {"score": 0.90, "metadata": {"text": "Interns get 12 days of leave.", "source_file": "leave-policy.txt"}},
+        {"score": 0.89, "metadata": {"text": "Insured employees get 5 days of hospital leave.",
+                                     "source_file": "inssurance-policy.txt"}}
+    ]
+    mock_llm.return_value = "Interns get 12 days of leave."
+
+    answer, _ = answer_question("EMP002", "How many days of leave do I get?", debug=False)
+
+    assert answer == "Interns get 12 days of leave."
+    mock_llm.assert_called_once()
+    print("✅ TEST 25 PASSED: Fast path falls back on low margin")
+
+# =====================================
+# TEST 26: Concurrent Turns In One Session
+# =====================================
+@patch('rag.orchestrator.graph.get_user_context')
+@patch('rag.orchestrator.search')
+@patch('rag.orchestrator.generate')
+@fresh_cache
+def test_session_concurrent_turns(mock_generate, mock_search, mock_user):
+    """Test that two turns in one session run one after the other"""
+    sessions.clear()
+    mock_user.return_value = {"name": "John Doe", "employment_type": "full_time"}
+    mock_search.return_value = [{"metadata": {"text": "Full-time employees get 20 days of leave."}}]
+
+    calls = []
+    def slow_generate(prompt, context=None):
+        calls.append(context)
+        time.sleep(0.05)
+        n = len(calls)
+        return {"response": f"answer {n}", "context": [n] * (100 * n),
+                "prompt_eval_count": 10, "eval_count": 5}
+    mock_generate.side_effect = slow_generate
+
+    threads = [
+        threading.Thread(target=answer_question, args=("EMP001", q), kwargs={"session_id": "same"})
+        for q in ["How many leave days?", "Do they carry over?"]
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # The second turn must continue from the first turn's context
+    assert calls[0] is None
+    assert calls[1] == [1] * 100
+    assert len(sessions.get("same").history) == 2
+    sessions.clear()
+    print("✅ TEST 26 PASSED: Concurrent session turns serialized")
+
+# =====================================
+# TEST 27: Precomputed Answer On First Session Turn
+# =====================================
+@patch('rag.orchestrator.graph.get_user_context')
+@patch('rag.orchestrator.search')
+@patch('rag.orchestrator.generate')
+@fresh_cache
+def test_precomputed_answer_first_session_turn(mock_generate, mock_search, mock_user):
+    """Test that a session's opening question can use a precomputed answer"""
+    from rag.orchestrator import answer_cache_key, ANSWER_NAMESPACE
+    import rag.orchestrator
+    sessions.clear()
+    mock_user.return_value = {"name": "Jane Smith", "employment_type": "intern"}
+    mock_search.return_value = [{"metadata": {"text": "Unused intern leave lapses."}}]
+    mock_generate.return_value = {"response": "It lapses.", "context": [1, 2, 3]}
+    rag.orchestrator.cache.set(ANSWER_NAMESPACE, answer_cache_key("intern", "How many leave days do I get?"),
+              {"answer": "Interns get 12 days.", "context": []})
+
+    first, _ = answer_question("EMP002", "How many leave days do I get?", session_id="fresh")
+    answer_question("EMP002", "Do they carry over?", session_id="fresh")
+
+    assert first == "Interns get 12 days."
+    # The follow-up is generated with the precomputed turn in its history
+    assert "Interns get 12 days." in mock_generate.call_args.args[0]
+    assert len(sessions.get("fresh").history) == 2
+    sessions.clear()
+    print("✅ TEST 27 PASSED: Precomputed answer on first session turn")
+
+# =====================================
+# TEST 28: Only One Worker Rebuilds
+# =====================================
+@patch('rag.precompute.precompute_answers')
+def test_precompute_rebuild_lock(mock_precompute):
+    """Test that concurrent warm-ups start a single background rebuild"""
+    started = threading.Event()
+    release = threading.Event()
+    def slow_precompute():
+        started.set()
+        release.wait(5)
+    mock_precompute.side_effect = slow_precompute
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with patch.object(rag.precompute, "PRECOMPUTED_FILE", os.path.join(tmp, "answers.json")):
+            assert rag.precompute.rebuild_in_background() is True
+            started.wait(5)
+            assert rag.precompute.rebuild_in_background() is False
+            release.set()
+
+            for _ in range(100):
+                if not os.path.exists(rag.precompute.PRECOMPUTED_FILE + ".lock"):
+                    break
+                time.sleep(0.01)
+            assert not os.path.exists(rag.precompute.PRECOMPUTED_FILE + ".lock")
+
+            rag.precompute.write_precomputed({"run_id": "r"})
+            assert os.listdir(tmp) == ["answers.json"]
+
+    assert mock_precompute.call_count == 1
+    print("✅ TEST 28 PASSED: Only one worker rebuilds")
+
+# =====================================
+# TEST 29: Memory Cache Is Bounded
+# =====================================
+def test_memory_cache_bounded():
+    """Test LRU eviction and TTL purge in the in-process cache"""
+    store = MemoryCache(max_entries=2)
+    store.set("embeddings", "a", [0.1])
+    store.set("embeddings", "b", [0.2])
+    store.get("embeddings", "a")
+    store.set("embeddings", "c", [0.3])
+
+    assert store.get("embeddings", "b") is None
+    assert store.get("embeddings", "a") == [0.1]
+
+    store.set("embeddings", "old", [0.4], ttl=-1)
+    store.purge_expired()
+    assert len(store._data) == 2
+    print("✅ TEST 29 PASSED: Memory cache bounded")
+
+# =====================================
+# TEST 30: Session Continues On Another Worker
+# =====================================
+@patch('rag.orchestrator.graph.get_user_context')
+@patch('rag.orchestrator.search')
+@patch('rag.orchestrator.generate')
+@fresh_cache
+def test_session_shared_across_workers(mock_generate, mock_search, mock_user):
+    """Test that a follow-up handled by a second worker continues the session"""
+    mock_user.return_value = {"name": "John Doe", "employment_type": "full_time"}
+    mock_search.return_value = [{"metadata": {"text": "Full-time employees get 20 days of leave."}}]
+    mock_generate.side_effect = [
+        {"response": "20 days.", "context": [7] * 200, "prompt_eval_count": 190, "eval_count": 10},
+        {"response": "Yes.", "context": [7] * 260, "prompt_eval_count": 50, "eval_count": 10},
+    ]
+
+    # Each worker process has its own SessionStore but shares the cache backend
+    with patch('rag.orchestrator.sessions', SessionStore()):
+        answer_question("EMP001", "How many leave days?", session_id="w")
+    with patch('rag.orchestrator.sessions', SessionStore()):
+        answer_question("EMP001", "Do they carry over?", session_id="w")
+
+    assert mock_generate.call_args.kwargs["context"] == [7] * 200
+    print("✅ TEST 30 PASSED: Session shared across workers")
+
+# =====================================
+# TEST 31: Redis Cache Namespaces
+# =====================================
+class FakeRedis:
+    """Just enough of the redis client for RedisCache"""
+
+    def __init__(self):
+        self.values = {}
+        self.zsets = {}
+
+    def get(self, k):
+        return self.values.get(k)
+
+    def set(self, k, v, ex=None):
+        self.values[k] = v
+
+    def delete(self, *keys):
+        for k in keys:
+            self.values.pop(k, None)
+            self.zsets.pop(k, None)
+
+    def zadd(self, k, mapping):
+        self.zsets.setdefault(k, {}).update(mapping)
+
+    def zrem(self, k, *members):
+        for m in members:
+            self.zsets.get(k, {}).pop(m, None)
+
+    def zremrangebyscore(self, k, low, high):
+        zset = self.zsets.get(k, {})
+        for m in [m for m, score in zset.items() if float(low) <= score <= float(high)]:
+            del zset[m]
+
+    def zrange(self, k, start, end):
+        members = [m for m, _ in sorted(self.zsets.get(k, {}).items(), key=lambda x: (x[1], x[0]))]
+        return members[start:] if end == -1 else members[start:end + 1]
+
+    def zcard(self, k):
+        return len(self.zsets.get(k, {}))
+
+    def scan_iter(self, match=None, count=None):
+        return [k for k in list(self.values) + list(self.zsets) if fnmatch.fnmatchcase(k, match)]
+
+def test_redis_cache_namespaces():
+    """Test that Redis invalidation removes exactly one namespace"""
+    from cache.redis_backend import RedisCache
+    store = RedisCache(client=FakeRedis())
+
+    store.set("embeddings", "q*", [0.5, 0.25])
+    store.set("embeddings:nomic-embed-text", "q", [1.0])
+    store.set("answers", "q1", {"answer": "12 days"})
+
+    assert store.get("embeddings", "q*") == [0.5, 0.25]
+    store.invalidate("embeddings")
+    assert store.get("embeddings", "q*") is None
+    assert store.get("embeddings:nomic-embed-text", "q") == [1.0]
+
+    # Expired members are dropped from the namespace index on the next write
+    fake = store.client
+    store.set("sessions", "old", {"x": 1}, ttl=-1)
+    store.set("sessions", "new", {"x": 2}, ttl=60)
+    assert fake.zcard("onboarding:n:sessions") == 1
+
+    store.set("sessions", "newer", {"x": 3}, ttl=120)
+    store.trim("sessions", 1)
+    assert store.get("sessions", "new") is None
+    assert store.get("sessions", "newer") == {"x": 3}
+    assert fake.zcard("onboarding:n:sessions") == 1
+
+    store.delete("answers", "q1")
+    assert store.get("answers", "q1") is None
+    store.clear()
+    assert store.get("embeddings:nomic-embed-text", "q") is None
+    print("✅ TEST 31 PASSED: Redis cache namespaces")
+
+# =====================================
+# TEST 32: Fast Path Respects Employment Type
+# =====================================
+def test_fast_path_role_aware():
+    """Test role filtering, chunk-edge fragments and same-document neighbours"""
+    from rag.extractive import fast_answer
+    results = [
+        {"score": 0.91, "metadata": {
+            "text": "employees get 20 days of annual leave. Interns get 12 days of leave per year. Leave requests go",
+            "source_file": "leave-policy.txt"}},
+        # Overlapping window of the same file: does not count against the margin
+        {"score": 0.90, "metadata": {
+            "text": "Interns get 12 days of leave per year. Leave requests go to the manager.",
+            "source_file": "leave-policy.txt"}},
+        {"score": 0.70, "metadata": {"text": "Work from home twice a week.", "source_file": "wfh-policy.txt"}}
+    ]
+    question = "How many leave days do I get?"
+
+    intern = fast_answer(question, results, "intern")
+    assert intern.startswith("Interns get 12 days of leave per year.")
+    assert "20 days" not in intern and "requests go" not in intern
+
+    # Only an intern sentence is complete, so a full-time user gets the LLM
+    assert fast_answer(question, results, "full_time") is None
+    assert fast_answer(question, results, None) is None
+    # ...unless they ask about interns
+    assert fast_answer("How many leave days do interns get?", results, "full_time") == intern
+    print("✅ TEST 32 PASSED: Fast path respects employment type")
+
+# =====================================
+# TEST 33: Fast Path On First Session Turn
+# =====================================
+@patch('rag.orchestrator.FAST_ANSWER_ENABLED', True)
+@patch('rag.orchestrator.graph.get_user_context')
+@patch('rag.orchestrator.search')
+@patch('rag.orchestrator.generate')
+@fresh_cache
+def test_fast_path_first_session_turn(mock_generate, mock_search, mock_user):
+    """Test that a session's opening question can take the fast path"""
+    sessions.clear()
+    mock_user.return_value = {"name": "Jane Smith", "employment_type": "intern"}
+    mock_search.return_value = [
+        {"score": 0.92, "metadata": {"text": "Interns get 12 days of leave per year.",
+                                     "source_file": "leave-policy.txt"}}
+    ]
+    mock_generate.return_value = {"response": "They lapse.", "context": [1, 2]}
+
+    first, _ = answer_question("EMP002", "How many leave days do interns get?", session_id="fast")
+    answer_question("EMP002", "How many leave days do interns get?", session_id="fast")
+
+    assert "Source: leave-policy.txt" in first
+    # Follow-ups always go to the LLM, with the extractive turn in the history
+    assert mock_generate.call_count == 1
+    assert "Interns get 12 days of leave per year." in mock_generate.call_args.args[0]
+    sessions.clear()
+    print("✅ TEST 33 PASSED: Fast path on first session turn")
+
+# =====================================
+# TEST 34: Prefill Savings Survive Local Eviction
+# =====================================
+@patch('rag.orchestrator.graph.get_user_context')
+@patch('rag.orchestrator.search')
+@patch('rag.orchestrator.generate')
+@fresh_cache
+def test_chat_prefill_saved_per_turn(mock_generate, mock_search, mock_user):
+    """Test that /chat reports the turn's own savings even if the worker drops its Session object"""
+    store = SessionStore()
+    mock_user.return_value = {"name": "John Doe", "employment_type": "full_time"}
+    mock_search.return_value = [{"metadata": {"text": "Full-time employees get 20 days of leave."}}]
+
+    def generate_then_evict(prompt, context=None):
+        store._sessions.clear()
+        if context is None:
+            return {"response": "20 days.", "context": [3] * 100, "prompt_eval_count": 90, "eval_count": 10}
+        return {"response": "Yes.", "context": [3] * 160, "prompt_eval_count": 40, "eval_count": 10}
+    mock_generate.side_effect = generate_then_evict
+
+    with patch('rag.orchestrator.sessions', store):
+        client.post("/chat", json={"user_id": "EMP001", "question": "Leave?", "session_id": "ev"})
+        data = client.post("/chat", json={"user_id": "EMP001", "question": "Carry over?", "session_id": "ev"}).json()
+
+    assert data["prefill_tokens_saved"] == 110
+    print("✅ TEST 34 PASSED: Prefill savings reported per turn")
+
+# =====================================
+# TEST 35: Workers Reload Rebuilt Answers
+# =====================================
+@patch('rag.precompute.read_ingestion_run')
+@fresh_cache
+def test_reload_precomputed_on_change(mock_run):
+    """Test that a worker loads precomputed answers rebuilt by another process"""
+    from rag.orchestrator import cached_answer
+    mock_run.return_value = "unversioned"
+
+    def answers(text):
+        return {"run_id": "unversioned", "embed_model": EMBED_MODEL, "embeddings": {},
+                "answers": [{"employment_type": "intern", "question": "When is salary paid?",
+                             "answer": text, "context": []}]}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "answers.json")
+        with patch.object(rag.precompute, "PRECOMPUTED_FILE", path):
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(answers("Old answer."), f)
+            assert rag.precompute.warm_up() == 1
+            assert rag.precompute.reload_if_changed() == 0
+
+            # Another worker rebuilds the file
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(answers("New answer."), f)
+            os.utime(path, (time.time() + 5, time.time() + 5))
+
+            assert rag.precompute.reload_if_changed() == 1
+            assert cached_answer("intern", "When is salary paid?")["answer"] == "New answer."
+    print("✅ TEST 35 PASSED: Workers reload rebuilt answers")
+
+# =====================================
+# TEST 36: Fast Path Margin Within One Document
+# =====================================
+@patch('rag.orchestrator.FAST_ANSWER_ENABLED', True)
+@patch('rag.orchestrator.graph.get_user_context')
+@patch('rag.orchestrator.search')
+@patch('rag.orchestrator.ask_llm')
+@fresh_cache
+def test_fast_path_same_document_margin(mock_llm, mock_search, mock_user):
+    """Test that a close, non-overlapping chunk of the same file sends the question to the LLM"""
+    mock_user.return_value = {"name": "Jane Smith", "employment_type": "intern"}
+    mock_search.return_value = [
+        {"score": 0.82, "metadata": {"text": "Annual leave for interns is 12 days.",
+                                     "source_file": "leave-policy.txt"}},
+        {"score": 0.819, "metadata": {"text": "Sick leave for interns is 6 days.",
+                                      "source_file": "leave-policy.txt"}}
+    ]
+    mock_llm.return_value = "Interns get 12 days of annual leave and 6 sick days."
+
+    answer, _ = answer_question("EMP002", "How many leave days do interns get?")
+
+    assert answer == "Interns get 12 days of annual leave and 6 sick days."
+    mock_llm.assert_called_once()
+    print("✅ TEST 36 PASSED: Fast path margin within one document")
+
 # =====================================
 # Run All Tests
 # =====================================
@@ -338,7 +1004,28 @@ if __name__ == "__main__":
     test_answer_with_debug_context()
     test_list_by_invalid_role()
     test_chat_response_structure()
+    test_session_followup_reuses_context()
+    test_session_store_eviction()
+    test_chat_with_session()
+    test_precomputed_answer_cache_hit()
+    test_warm_up_versioned()
+    test_sqlite_cache_shared()
+    test_cache_backend_selection()
+    test_user_context_cached()
+    test_fast_path_extractive_answer()
+    test_fast_path_low_margin()
+    test_session_concurrent_turns()
+    test_precomputed_answer_first_session_turn()
+    test_precompute_rebuild_lock()
+    test_memory_cache_bounded()
+    test_session_shared_across_workers()
+    test_redis_cache_namespaces()
+    test_fast_path_role_aware()
+    test_fast_path_first_session_turn()
+    test_chat_prefill_saved_per_turn()
+    test_reload_precomputed_on_change()
+    test_fast_path_same_document_margin()
     
     print("\n" + "="*50)
-    print("✅ ALL 15 TESTS PASSED!")
+    print("✅ ALL 36 TESTS PASSED!")
     print("="*50 + "\n")
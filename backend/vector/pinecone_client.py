@@ -2,8 +2,14 @@ from pinecone import Pinecone
 import requests
 import os
 from dotenv import load_dotenv
+from cache.store import cache
 load_dotenv()
 
+EMBED_MODEL = "nomic-embed-text"
+EMBED_NAMESPACE = f"embeddings:{EMBED_MODEL}"
+# Every distinct question typed gets embedded; don't keep them forever
+EMBED_CACHE_TTL = int(os.getenv("EMBED_CACHE_TTL", "86400"))
+
 
 pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
 
@@ -12,11 +18,17 @@ print("PINECONE_API_KEY =", os.getenv("PINECONE_API_KEY"))
 
 
 def embed(text: str):
+    cached = cache.get(EMBED_NAMESPACE, text)
+    if cached is not None:
+        return cached
+
     r = requests.post(
         os.getenv("OLLAMA_BASE_URL") + "/api/embeddings",
-        json={"model": "nomic-embed-text", "prompt": text}
+        json={"model": EMBED_MODEL, "prompt": text}
     )
-    return r.json()["embedding"]
+    vec = r.json()["embedding"]
+    cache.set(EMBED_NAMESPACE, text, vec, ttl=EMBED_CACHE_TTL)
+    return vec
 
 def search(query: str, filters: dict | None = None):
     vec = embed(query)
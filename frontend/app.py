@@ -1,5 +1,6 @@
 import streamlit as st
 import requests
+import uuid
 
 st.set_page_config(page_title="Onboarding Buddy", page_icon="🤖")
 
@@ -47,6 +48,11 @@ with st.sidebar:
     # Checkbox to show debug information
     show_debug = st.checkbox("Show retrieved context (debug)")
 
+    # Follow-up questions share a backend session until a new one is started
+    new_conversation = st.button("New conversation")
+    if "session_id" not in st.session_state or new_conversation:
+        st.session_state.session_id = str(uuid.uuid4())
+
 # -----------------------------
 # Main Area
 # -----------------------------
@@ -70,6 +76,7 @@ if st.button("Ask"):
                         "user_id": user_id,  # User's ID
                         "question": question,  # The question being asked
                         "role": role,  # Send the user's role
+                        "session_id": st.session_state.session_id,  # Conversation session
                         "debug": show_debug  # Include debug flag
                     },
                     timeout=120